@@ -101,11 +101,10 @@ def pytest_sessionstart(session):  # pragma: no cover
 # ----------------------------- Fixtures ----------------------------- #
 
 
-@pytest.fixture
-def dummy_signal():
-    """Dummy signal of shape <(3, 3)|(3, 3)>. If this is changed, all
-    tests using this signal will fail since they compare the output from
-    methods using this signal (as input) to hard-coded outputs.
+@pytest.fixture(scope="session")
+def dummy_array():
+    """Read-only data of the dummy signal, created once per test
+    session.
     """
     # fmt: off
     dummy_array = np.array(
@@ -118,7 +117,59 @@ def dummy_signal():
         dtype=np.uint8
     ).reshape((3, 3, 3, 3))
     # fmt: on
-    return kp.signals.EBSD(dummy_array)
+    dummy_array.flags.writeable = False
+    return dummy_array
+
+
+@pytest.fixture
+def dummy_signal(dummy_array):
+    """Dummy signal of shape <(3, 3)|(3, 3)>. If this is changed, all
+    tests using this signal will fail since they compare the output from
+    methods using this signal (as input) to hard-coded outputs.
+    """
+    return kp.signals.EBSD(dummy_array.copy())
+
+
+@pytest.fixture(scope="session")
+def dummy_pattern_f32(dummy_array):
+    """Read-only first pattern of the dummy signal as float32, created
+    once per test session. Copy it before modifying it in a test.
+    """
+    pattern = np.ascontiguousarray(dummy_array[0, 0], dtype=np.float32)
+    pattern.flags.writeable = False
+    return pattern
+
+
+@pytest.fixture(scope="session")
+def fft_input_101():
+    """Read-only pattern of shape (101, 101) of ones with a single
+    brighter pixel in the centre, created once per test session.
+    """
+    pattern = np.ones((101, 101))
+    pattern[50, 50] = 2
+    pattern.flags.writeable = False
+    return pattern
+
+
+@pytest.fixture(scope="session")
+def white_noise_1001():
+    """Read-only white noise pattern of shape (1001, 1001), created once
+    per test session.
+    """
+    rng = np.random.default_rng(0)
+    pattern = rng.random((1001, 1001), dtype=np.float64)
+    pattern.flags.writeable = False
+    return pattern
+
+
+@pytest.fixture(scope="session")
+def flat_1001():
+    """Read-only flat pattern of shape (1001, 1001), created once per
+    test session.
+    """
+    pattern = np.full((1001, 1001), 5.0)
+    pattern.flags.writeable = False
+    return pattern
 
 
 @pytest.fixture
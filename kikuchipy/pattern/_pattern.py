@@ -16,6 +16,7 @@
 # You should have received a copy of the GNU General Public License
 # along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
 
+from functools import lru_cache
 from typing import Union, Tuple, Optional, List
 
 from numba import njit
@@ -33,6 +34,7 @@ def rescale_intensity(
     in_range: Optional[Tuple[Union[int, float], ...]] = None,
     out_range: Optional[Tuple[Union[int, float], ...]] = None,
     dtype_out: Optional[np.dtype] = None,
+    out: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     """Rescale intensities in an EBSD pattern.
 
@@ -51,17 +53,36 @@ def rescale_intensity(
     out_range
         Min./max. intensity values of the rescaled pattern. If None
         (default), it is set to `dtype_out` min./max according to
-        `skimage.util.dtype.dtype_range`.
+        `skimage.util.dtype.dtype_range`. Must be within the range of
+        `dtype_out` if this is an integer data type.
     dtype_out
         Data type of the rescaled pattern. If None (default), it is set
-        to the same data type as the input pattern.
+        to the data type of `out` if passed, otherwise to the same data
+        type as the input pattern.
+    out
+        C-contiguous array of the same shape as the pattern to write
+        the rescaled pattern to. If None (default), a new array is
+        allocated.
 
     Returns
     -------
     rescaled_pattern : numpy.ndarray
-        Rescaled pattern.
+        Rescaled pattern, which is `out` if passed.
     """
-    if dtype_out is None:
+    if out is not None:
+        if out.shape != pattern.shape or not out.flags.c_contiguous:
+            raise ValueError(
+                f"Output array of shape {out.shape} must be C-contiguous and "
+                f"have the pattern shape {pattern.shape}"
+            )
+        if dtype_out is None:
+            dtype_out = out.dtype.type
+        elif np.dtype(dtype_out) != out.dtype:
+            raise ValueError(
+                f"Output array data type '{out.dtype}' must be equal to "
+                f"`dtype_out` '{np.dtype(dtype_out)}'"
+            )
+    elif dtype_out is None:
         dtype_out = pattern.dtype.type
 
     if in_range is None:
@@ -82,20 +103,45 @@ def rescale_intensity(
             )
     else:
         omin, omax = out_range
+        if np.issubdtype(dtype_out, np.integer):
+            dtype_info = np.iinfo(dtype_out)
+            if min(omin, omax) < dtype_info.min or max(omin, omax) > dtype_info.max:
+                raise ValueError(
+                    f"Output intensity range {out_range} must be within the range "
+                    f"of the output data type '{np.dtype(dtype_out)}'"
+                )
 
-    return _rescale(pattern, imin, imax, omin, omax).astype(dtype_out)
+    # Rescale floating point patterns in their own precision, avoiding
+    # promotion to float64 by the intensity range scalars
+    if pattern.dtype.kind == "f":
+        dtype = pattern.dtype.type
+        imin, imax, omin, omax = dtype(imin), dtype(imax), dtype(omin), dtype(omax)
 
+    if out is None:
+        out = np.empty(pattern.shape, dtype=dtype_out)
+
+    _rescale(pattern.ravel(), imin, imax, omin, omax, out.reshape(-1))
+
+    return out
 
-@njit
+
+@njit(cache=True, nogil=True, error_model="numpy")
 def _rescale(
     pattern: np.ndarray,
     imin: Union[int, float],
     imax: Union[int, float],
     omin: Union[int, float],
     omax: Union[int, float],
+    out: np.ndarray,
 ) -> np.ndarray:
-    rescaled_pattern = (pattern - imin) / float(imax - imin)
-    return rescaled_pattern * (omax - omin) + omin
+    """Rescale intensities in a flattened pattern, writing them cast to
+    the data type of `out` to `out`.
+    """
+    irange = imax - imin
+    orange = omax - omin
+    for i in range(pattern.size):
+        out[i] = (pattern[i] - imin) / irange * orange + omin
+    return out
 
 
 def remove_dynamic_background(
@@ -194,6 +240,20 @@ def _dynamic_background_frequency_space_setup(
     truncate: Union[int, float],
 ) -> Tuple[
     Tuple[int, int], Tuple[int, int], np.ndarray, Tuple[int, int], Tuple[int, int]
+]:
+    # The setup only depends on the pattern shape and window
+    # parameters, so it is cached for repeated calls with single
+    # patterns or with chunks of patterns
+    return _dynamic_background_frequency_space_setup_cached(
+        tuple(pattern_shape), float(std), float(truncate)
+    )
+
+
+@lru_cache(maxsize=32)
+def _dynamic_background_frequency_space_setup_cached(
+    pattern_shape: Tuple[int, int], std: float, truncate: float
+) -> Tuple[
+    Tuple[int, int], Tuple[int, int], np.ndarray, Tuple[int, int], Tuple[int, int]
 ]:
     # Get Gaussian filtering window
     shape = (int(truncate * std),) * 2
@@ -208,6 +268,8 @@ def _dynamic_background_frequency_space_setup(
         offset_before_fft,
         offset_after_ifft,
     ) = _fft_filter_setup(pattern_shape, window)
+    # Prevent the cached transfer function from being modified
+    transfer_function.flags.writeable = False
 
     return (
         fft_shape,
@@ -323,24 +385,49 @@ def get_image_quality(
 
     if inertia_max is None:
         sy, sx = pattern.shape
-        inertia_max = np.sum(frequency_vectors) / (sy * sx)
+        inertia_max = np.sum(frequency_vectors, dtype=np.float64) / (sy * sx)
 
     if normalize is True:
         pattern = normalize_intensity(pattern)
 
-    # Compute FFT
-    # TODO: Reduce frequency vectors to real part only to enable real part FFT
-    fft_pattern = fft2(pattern)
-
-    # Obtain (un-shifted) FFT spectrum
-    spectrum = fft_spectrum(fft_pattern)
+    # Obtain (un-shifted) FFT spectrum of the non-negative frequencies
+    # along the last axis, which is all we need for a real pattern
+    spectrum = fft_spectrum(rfft2(pattern))
 
     # Calculate inertia (see Lassen1994)
-    inertia = np.sum(spectrum * frequency_vectors) / np.sum(spectrum)
+    weights, counts = _rfft_spectrum_weights(frequency_vectors)
+    inertia = np.sum(spectrum * weights) / np.sum(spectrum * counts)
 
     return 1 - (inertia / inertia_max)
 
 
+def _rfft_spectrum_weights(
+    frequency_vectors: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return frequency vector weights and the number of spectrum
+    components to apply to the spectrum of a real FFT, so that sums
+    over the spectrum equal those over the full FFT spectrum.
+
+    The full spectrum of a real pattern is conjugate symmetric, so each
+    component in the real FFT spectrum, except in the first column and
+    in the last column for an even width, also represents the component
+    at the negated frequency.
+    """
+    sy, sx = frequency_vectors.shape
+    nx = sx // 2 + 1
+
+    # Frequency vectors at negated frequencies: fv[-i % sy, -j % sx]
+    frequency_vectors_conj = np.roll(frequency_vectors[::-1, ::-1], 1, axis=(0, 1))
+
+    weights = frequency_vectors[:, :nx] + frequency_vectors_conj[:, :nx]
+    counts = np.full(nx, 2)
+    self_conj = [0, nx - 1] if sx % 2 == 0 else [0]
+    weights[:, self_conj] = frequency_vectors[:, self_conj]
+    counts[self_conj] = 1
+
+    return weights, counts
+
+
 def fft(
     pattern: np.ndarray,
     apodization_window: Union[None, np.ndarray, Window] = None,
@@ -465,17 +552,49 @@ def fft_filter(
     filtered_pattern : numpy.ndarray
         Filtered EBSD pattern.
     """
-    # Get the FFT
-    pattern_fft = fft(pattern, shift=shift, apodization_window=apodization_window)
+    transfer_function = np.asarray(transfer_function)
+    if np.iscomplexobj(pattern) or transfer_function.shape != pattern.shape:
+        # Get the FFT
+        pattern_fft = fft(pattern, shift=shift, apodization_window=apodization_window)
+
+        # Apply the transfer function to the FFT
+        filtered_fft = pattern_fft * transfer_function
+
+        # Get real part of IFFT of the filtered FFT
+        return np.real(ifft(filtered_fft, shift=shift))
+
+    # Filter real patterns via the real FFT, which only computes half of
+    # the conjugate symmetric spectrum
+    if apodization_window is not None:
+        pattern = pattern * apodization_window
+    transfer_function_half = _rfft_transfer_function(transfer_function, shift)
+    return irfft2(rfft2(pattern) * transfer_function_half, s=pattern.shape)
+
+
+def _rfft_transfer_function(
+    transfer_function: np.ndarray, shift: bool = False
+) -> np.ndarray:
+    """Return the part of a transfer function to apply to the real FFT
+    spectrum of a real pattern, so that the inverse real FFT equals the
+    real part of the inverse FFT of the filtered full spectrum.
+
+    Only the conjugate symmetric part of the transfer function
+    contributes to the real part of the filtered pattern, since the full
+    spectrum of a real pattern is conjugate symmetric.
+    """
+    if shift:
+        transfer_function = ifftshift(transfer_function)
+    nx = transfer_function.shape[1] // 2 + 1
 
-    # Apply the transfer function to the FFT
-    filtered_fft = pattern_fft * transfer_function
+    # Transfer function at negated frequencies: tf[-i % sy, -j % sx]
+    transfer_function_conj = np.roll(transfer_function[::-1, ::-1], 1, axis=(0, 1))
 
-    # Get real part of IFFT of the filtered FFT
-    return np.real(ifft(filtered_fft, shift=shift))
+    if np.iscomplexobj(transfer_function):
+        transfer_function_conj = np.conj(transfer_function_conj)
+    return (transfer_function[:, :nx] + transfer_function_conj[:, :nx]) / 2
 
 
-@njit
+@njit(cache=True)
 def fft_spectrum(fft_pattern: np.ndarray) -> np.ndarray:
     """Compute the FFT spectrum of a Fourier transformed EBSD pattern.
 
@@ -489,10 +608,10 @@ def fft_spectrum(fft_pattern: np.ndarray) -> np.ndarray:
     fft_spectrum : numpy.ndarray
         2D FFT spectrum of the EBSD pattern.
     """
-    return np.sqrt(fft_pattern.real ** 2 + fft_pattern.imag ** 2)
+    return np.hypot(fft_pattern.real, fft_pattern.imag)
 
 
-@njit
+@njit(cache=True, error_model="numpy")
 def normalize_intensity(
     pattern: np.ndarray, num_std: int = 1, divide_by_square_root: bool = False
 ) -> np.ndarray:
@@ -523,15 +642,36 @@ def normalize_intensity(
     ``np.float32`` with :meth:`numpy.ndarray.astype`, before normalizing
     the intensities.
     """
-    pattern_mean = np.mean(pattern)
-    pattern_std = np.std(pattern)
+    pattern_mean, pattern_std = _mean_std(pattern)
 
     if divide_by_square_root:
-        return (pattern - pattern_mean) / (
-            num_std * pattern_std * np.sqrt(pattern.size)
-        )
+        scale = 1 / (num_std * pattern_std * np.sqrt(pattern.size))
     else:
-        return (pattern - pattern_mean) / (num_std * pattern_std)
+        scale = 1 / (num_std * pattern_std)
+
+    return (pattern - pattern_mean) * scale
+
+
+@njit(cache=True)
+def _mean_std(pattern: np.ndarray) -> Tuple[float, float]:
+    """Return the mean and standard deviation of image intensities,
+    computed in a single pass.
+
+    The sums are accumulated in float64 relative to the first
+    intensity to avoid loss of precision when the mean is large
+    compared to the standard deviation.
+    """
+    shift = np.float64(pattern.flat[0])
+    sum_values = 0.0
+    sum_squares = 0.0
+    for value in pattern.flat:
+        value = np.float64(value) - shift
+        sum_values += value
+        sum_squares += value * value
+    n = pattern.size
+    mean = sum_values / n
+    variance = max(sum_squares / n - mean * mean, 0.0)
+    return mean + shift, np.sqrt(variance)
 
 
 def fft_frequency_vectors(shape: Tuple[int, int]) -> np.ndarray:
@@ -545,20 +685,16 @@ def fft_frequency_vectors(shape: Tuple[int, int]) -> np.ndarray:
     Returns
     -------
     frequency_vectors : numpy.ndarray
-        Frequency vectors.
+        Frequency vectors of data type int32.
     """
     sy, sx = shape
 
-    linex = np.arange(sx) + 1
+    linex = np.arange(1, sx + 1, dtype=np.int32)
     linex[sx // 2 :] -= sx + 1
-    liney = np.arange(sy) + 1
+    liney = np.arange(1, sy + 1, dtype=np.int32)
     liney[sy // 2 :] -= sy + 1
 
-    frequency_vectors = np.empty(shape=(sy, sx))
-    for i in range(sy):
-        frequency_vectors[i] = liney[i] ** 2 + linex ** 2 - 1
-
-    return frequency_vectors
+    return liney[:, np.newaxis] ** 2 + linex ** 2 - 1
 
 
 def _zero_mean(patterns: np.ndarray, axis: Tuple[int, tuple]) -> np.ndarray:
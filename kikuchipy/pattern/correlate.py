@@ -23,6 +23,7 @@
 from typing import Union
 
 from dask.array import Array
+from numba import njit
 import numpy as np
 
 from kikuchipy._util import deprecated
@@ -60,15 +61,43 @@ def normalized_correlation_coefficient(
     .. [Gonzalez2017] R. C. Gonzalez, R. E. Woods, "Digital Image\
         Processing," 4th edition, Pearson Education Limited, 2017.
     """
-    pattern = pattern.astype(np.float32)
-    template = template.astype(np.float32)
+    pattern = np.asarray(pattern)
+    template = np.asarray(template)
+    if pattern.shape != template.shape:
+        raise ValueError(
+            f"Pattern shape {pattern.shape} and template shape {template.shape} "
+            "must be equal"
+        )
+    return _normalized_correlation_coefficient(
+        pattern.ravel(), template.ravel(), zero_normalised
+    )
 
-    if zero_normalised:
-        pattern = pattern - pattern.mean()
-        template = template - template.mean()
 
-    coefficient = np.sum(pattern * template) / np.sqrt(
-        np.sum(pattern ** 2) * np.sum(template ** 2)
-    )
+@njit(cache=True, nogil=True, error_model="numpy")
+def _normalized_correlation_coefficient(
+    pattern: np.ndarray, template: np.ndarray, zero_normalised: bool
+) -> float:
+    """Compute the correlation coefficient in a single pass over the
+    flattened pattern and template, accumulating in float64.
+    """
+    sum_p = 0.0
+    sum_t = 0.0
+    sum_pp = 0.0
+    sum_tt = 0.0
+    sum_pt = 0.0
+    for i in range(pattern.size):
+        p = np.float64(pattern[i])
+        t = np.float64(template[i])
+        sum_p += p
+        sum_t += t
+        sum_pp += p * p
+        sum_tt += t * t
+        sum_pt += p * t
+
+    if zero_normalised:
+        n = pattern.size
+        sum_pt -= sum_p * sum_t / n
+        sum_pp -= sum_p * sum_p / n
+        sum_tt -= sum_t * sum_t / n
 
-    return coefficient
+    return sum_pt / np.sqrt(sum_pp * sum_tt)
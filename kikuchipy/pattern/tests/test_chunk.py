@@ -28,9 +28,12 @@ from kikuchipy.filters.window import Window
 from kikuchipy.pattern._pattern import (
     _dynamic_background_frequency_space_setup,
     fft_filter,
+    fft_frequency_vectors,
     fft_spectrum,
+    rescale_intensity,
 )
 from kikuchipy.pattern import chunk
+from kikuchipy.pattern.tests.test_pattern import Int32SumArray
 from kikuchipy.signals.util._dask import get_dask_array
 
 
@@ -200,6 +203,92 @@ class TestRescaleIntensityChunk:
         assert np.allclose(p1, answer)
         assert not np.allclose(p1, p2, atol=1)
 
+    @pytest.mark.parametrize(
+        "dtype, kwargs",
+        [
+            (np.uint8, dict()),
+            (np.uint8, dict(in_range=(10, 200), dtype_out=np.uint16)),
+            (np.uint8, dict(percentiles=(1, 99))),
+            (np.uint16, dict(in_range=(1000, 50000))),
+        ],
+    )
+    def test_rescale_intensity_lookup_table(self, dtype, kwargs):
+        """Integer patterns rescaled via a lookup table equal patterns
+        rescaled one by one.
+        """
+        rng = np.random.default_rng(42)
+        patterns = rng.integers(0, np.iinfo(dtype).max, (2, 3, 200, 200), dtype=dtype)
+
+        rescaled_patterns = chunk.rescale_intensity(patterns, **kwargs)
+
+        dtype_out = kwargs.get("dtype_out", dtype)
+        rescaled_patterns2 = np.empty_like(patterns, dtype=dtype_out)
+        for idx in np.ndindex(patterns.shape[:-2]):
+            in_range = kwargs.get("in_range")
+            if "percentiles" in kwargs:
+                in_range = np.percentile(patterns[idx], q=kwargs["percentiles"])
+            rescaled_patterns2[idx] = rescale_intensity(
+                patterns[idx], in_range=in_range, dtype_out=dtype_out
+            )
+
+        assert rescaled_patterns.dtype == dtype_out
+        np.testing.assert_array_equal(rescaled_patterns, rescaled_patterns2)
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            dict(percentiles=(2, 98), dtype_out=np.uint8),
+            dict(percentiles=(1, 99), dtype_out=np.uint16),
+            dict(percentiles=(1, 99), dtype_out=np.int16),
+            dict(in_range=(10.5, 150.2), dtype_out=np.uint16),
+        ],
+    )
+    def test_rescale_intensity_float32_float64_limits(self, kwargs):
+        """Float32 patterns are clipped to float64 limits in float32 and
+        rescaled in float64, like a single pattern is clipped to and
+        rescaled with scalar limits.
+        """
+        rng = np.random.default_rng(42)
+        patterns = (rng.random((4, 6, 40, 25)) * 200).astype(np.float32)
+
+        rescaled_patterns = chunk.rescale_intensity(patterns, **kwargs)
+
+        dtype_out = kwargs["dtype_out"]
+        omin, omax = dtype_range[dtype_out]
+        rescaled_patterns2 = np.empty_like(patterns, dtype=dtype_out)
+        for idx in np.ndindex(patterns.shape[:-2]):
+            if "percentiles" in kwargs:
+                imin, imax = np.percentile(patterns[idx], q=kwargs["percentiles"])
+            else:
+                imin, imax = kwargs["in_range"]
+            pattern = np.clip(patterns[idx], imin, imax).astype(np.float64)
+            pattern = (pattern - imin) / (imax - imin)
+            rescaled_patterns2[idx] = pattern * (omax - omin) + omin
+
+        assert rescaled_patterns.dtype == dtype_out
+        np.testing.assert_array_equal(rescaled_patterns, rescaled_patterns2)
+
+    @pytest.mark.parametrize("dtype_out", [np.uint16, np.int16])
+    def test_rescale_intensity_float32_out_range_double(self, dtype_out):
+        """Float32 patterns are rescaled from their min./max. intensity
+        in float32, with the output range applied in float64 before
+        rounding to float32, like a single pattern is rescaled.
+        """
+        rng = np.random.default_rng(42)
+        patterns = (rng.random((10, 10, 60, 60)) * 2000 - 500).astype(np.float32)
+
+        rescaled_patterns = chunk.rescale_intensity(patterns, dtype_out=dtype_out)
+
+        omin, omax = dtype_range[dtype_out]
+        rescaled_patterns2 = np.empty_like(patterns, dtype=dtype_out)
+        for idx in np.ndindex(patterns.shape[:-2]):
+            imin, imax = patterns[idx].min(), patterns[idx].max()
+            pattern = (patterns[idx] - imin) / (imax - imin)
+            pattern = pattern.astype(np.float64) * (omax - omin) + omin
+            rescaled_patterns2[idx] = pattern.astype(np.float32)
+
+        np.testing.assert_array_equal(rescaled_patterns, rescaled_patterns2)
+
 
 class TestRemoveStaticBackgroundChunk:
     @pytest.mark.parametrize(
@@ -293,7 +382,70 @@ class TestRemoveStaticBackgroundChunk:
         assert corrected_patterns.dtype == dtype_out
         assert np.allclose(corrected_patterns[0, 0], answer, atol=1e-4)
 
+    @pytest.mark.parametrize(
+        "dtype, dtype_bg, bg_max",
+        [
+            (np.uint16, np.uint8, 60000),
+            (np.int16, np.uint8, 3000),
+            (np.int16, np.float32, 3000),
+            (np.float32, np.uint8, 2),
+        ],
+    )
+    @pytest.mark.parametrize("operation_func", [np.subtract, np.divide])
+    def test_remove_static_background_chunk_scalebg_mixed_dtypes(
+        self, dtype, dtype_bg, bg_max, operation_func
+    ):
+        """A static background scaled to the intensity range of patterns
+        of another data type does not wrap around in the background's
+        data type.
+        """
+        rng = np.random.default_rng(42)
+        patterns = (rng.random((2, 3, 30, 20)) * (bg_max - 1) + 1).astype(dtype)
+        static_bg = (rng.random((30, 20)) * 200 + 1).astype(dtype_bg)
+
+        corrected_patterns = chunk.remove_static_background(
+            patterns=patterns,
+            static_bg=static_bg,
+            operation_func=operation_func,
+            scale_bg=True,
+        )
 
+        # Background scaled to each pattern's intensity range, in the
+        # data type of both patterns and background
+        bg = static_bg.astype(np.float64)
+        bg = (bg - bg.min()) / (bg.max() - bg.min())
+        pmin = patterns.min(axis=(-2, -1), keepdims=True).astype(np.float64)
+        pmax = patterns.max(axis=(-2, -1), keepdims=True).astype(np.float64)
+        scaled_bg = bg * (pmax - pmin) + pmin
+        scaled_bg = scaled_bg.astype(np.result_type(dtype, dtype_bg))
+        corrected_patterns2 = chunk.rescale_intensity(
+            operation_func(patterns, scaled_bg), dtype_out=dtype
+        )
+
+        assert corrected_patterns.dtype == dtype
+        np.testing.assert_array_equal(corrected_patterns, corrected_patterns2)
+
+    @pytest.mark.parametrize("operation_func", [np.subtract, np.divide])
+    def test_remove_static_background_chunk_mixed_dtypes(self, operation_func):
+        """The static background is removed in NumPy's result data type
+        of the pattern and background data types, here float32.
+        """
+        rng = np.random.default_rng(42)
+        patterns = rng.integers(1, 3000, (10, 10, 60, 60)).astype(np.int16)
+        static_bg = (rng.random((60, 60)) * 200 + 1).astype(np.float32)
+
+        corrected_patterns = chunk.remove_static_background(
+            patterns=patterns, static_bg=static_bg, operation_func=operation_func
+        )
+
+        removed = operation_func(patterns, static_bg)
+        assert removed.dtype == np.float32
+        corrected_patterns2 = chunk.rescale_intensity(removed, dtype_out=np.int16)
+
+        np.testing.assert_array_equal(corrected_patterns, corrected_patterns2)
+
+
+@pytest.mark.slow_image
 class TestRemoveDynamicBackgroundChunk:
     @pytest.mark.parametrize(
         "std, answer",
@@ -439,6 +591,7 @@ class TestRemoveDynamicBackgroundChunk:
         assert np.allclose(corrected_patterns[0, 0], answer, atol=1e-4)
 
 
+@pytest.mark.slow_image
 class TestGetDynamicBackgroundChunk:
     @pytest.mark.parametrize(
         "std, answer",
@@ -569,6 +722,29 @@ class TestAdaptiveHistogramEqualizationChunk:
         assert equalized_patterns.dtype == dtype_out
         assert np.allclose(equalized_patterns[0, 0].compute(), ADAPT_EQ_UINT8)
 
+    @pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.float32])
+    def test_adaptive_histogram_equalization_chunk_fallback(self, monkeypatch, dtype):
+        # Equalizing patterns one by one with equalize_adapthist(), as
+        # with scikit-image < 0.19, gives the same patterns
+        rng = np.random.default_rng(0)
+        patterns = rng.random((2, 3, 30, 40))
+        if np.issubdtype(dtype, np.integer):
+            patterns = (patterns * 200).astype(dtype)
+        else:
+            patterns = (patterns * 2 - 1).astype(dtype)
+        kwargs = dict(kernel_size=(10, 10), nbins=128)
+        equalized_patterns = chunk.adaptive_histogram_equalization(patterns, **kwargs)
+
+        monkeypatch.setattr(chunk, "_CLAHE_ND", False)
+        equalized_patterns2 = chunk.adaptive_histogram_equalization(patterns, **kwargs)
+
+        assert equalized_patterns2.shape == patterns.shape
+        assert equalized_patterns2.dtype == dtype
+        # Integer patterns are equal, float patterns to within rounding
+        np.testing.assert_allclose(
+            equalized_patterns2, equalized_patterns, rtol=0, atol=1e-6
+        )
+
 
 class TestAverageNeighbourPatternsChunk:
     @pytest.mark.parametrize("dtype_in", [None, np.uint8])
@@ -659,6 +835,16 @@ class TestGetImageQualityChunk:
         iq = chunk.get_image_quality(patterns=p, normalize=False)
         assert np.allclose(iq, 1, atol=1e-2)
 
+    def test_get_image_quality_inertia_max_no_overflow(self):
+        # The sum of the frequency vectors overflows a 32-bit integer
+        fv = fft_frequency_vectors((480, 480)).view(Int32SumArray)
+        assert np.sum(fv) != 8_902_502_400
+
+        p = np.random.default_rng(0).random((2, 480, 480)).astype(np.float32)
+        iq = chunk.get_image_quality(patterns=p, frequency_vectors=fv)
+        iq2 = chunk.get_image_quality(patterns=p, inertia_max=8_902_502_400 / 480 ** 2)
+        assert np.allclose(iq, iq2, rtol=1e-6)
+
 
 class TestFFTFilterChunk:
     @pytest.mark.parametrize(
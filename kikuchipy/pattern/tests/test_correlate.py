@@ -39,3 +39,39 @@ class TestNormalizedCrossCorrelation:
                 zero_normalised=True,
             )
             assert np.allclose(coefficient, answer, atol=1e-7)
+
+    @pytest.mark.parametrize("zero_normalised", [True, False])
+    @pytest.mark.parametrize("dtype", [np.uint8, np.float32, np.float64])
+    @pytest.mark.parametrize("flat", [False, True])
+    def test_normalised_correlation_coefficient_reference(
+        self, dummy_signal, zero_normalised, dtype, flat
+    ):
+        pattern = dummy_signal.inav[0, 0].data.astype(dtype)
+        template = dummy_signal.inav[1, 2].data.astype(dtype)
+        if flat:
+            pattern = np.zeros_like(pattern)
+
+        p = pattern.astype(np.float64)
+        t = template.astype(np.float64)
+        if zero_normalised:
+            p -= p.mean()
+            t -= t.mean()
+        with np.errstate(invalid="ignore"):
+            answer = np.sum(p * t) / np.sqrt(np.sum(p ** 2) * np.sum(t ** 2))
+
+        with pytest.warns(np.VisibleDeprecationWarning, match="Function "):
+            coefficient = normalized_correlation_coefficient(
+                pattern=pattern, template=template, zero_normalised=zero_normalised
+            )
+            assert np.isnan(answer) == flat
+            assert np.isclose(coefficient, answer, atol=1e-12, equal_nan=True)
+
+    @pytest.mark.parametrize("template_shape", [(40, 40), (4000,), (50, 40)])
+    def test_normalised_correlation_coefficient_shape_raises(self, template_shape):
+        rng = np.random.default_rng(42)
+        pattern = rng.random((40, 50))
+        template = rng.random(template_shape)
+
+        with pytest.warns(np.VisibleDeprecationWarning, match="Function "):
+            with pytest.raises(ValueError, match="Pattern shape "):
+                _ = normalized_correlation_coefficient(pattern, template)
@@ -30,7 +30,6 @@ from dask.diagnostics import ProgressBar
 from hyperspy._signals.signal2d import Signal2D
 from hyperspy._lazy_signals import LazySignal2D
 from hyperspy.learn.mva import LearningResults
-from hyperspy.misc.utils import DictionaryTreeBrowser
 from hyperspy.roi import BaseInteractiveROI
 from hyperspy.api import interactive
 from h5py import File
@@ -53,12 +52,14 @@ from kikuchipy.indexing.similarity_metrics import SimilarityMetric
 from kikuchipy.signals.util._metadata import (
     ebsd_metadata,
     metadata_nodes,
+    _set_missing_metadata,
     _update_phase_info,
     _write_parameters_to_dictionary,
 )
 from kikuchipy.signals.util._dask import (
     get_dask_array,
     get_chunking,
+    _get_chunk_bytes_limit,
     _get_chunk_overlap_depth,
     _rechunk_learning_results,
     _update_learning_results,
@@ -110,9 +111,7 @@ class EBSD(CommonImage, Signal2D):
 
         # Update metadata if object is initialised from numpy array
         if not self.metadata.has_item(metadata_nodes("ebsd")):
-            md = self.metadata.as_dictionary()
-            md.update(ebsd_metadata().as_dictionary())
-            self.metadata = DictionaryTreeBrowser(md)
+            _set_missing_metadata(self.metadata, ebsd_metadata().as_dictionary())
         if not self.metadata.has_item("Sample.Phases"):
             self.set_phase_parameters()
 
@@ -625,9 +624,12 @@ class EBSD(CommonImage, Signal2D):
         ...     std=5,
         ... )  # doctest: +SKIP
         """
-        # Create a dask array of signal patterns and do the processing on this
+        # Create a dask array of signal patterns and do the processing on
+        # this. Split it into at least as many chunks as there are CPUs,
+        # so that all patterns are filtered in parallel
         dtype = np.float32
-        dask_array = get_dask_array(signal=self, dtype=dtype)
+        chunk_bytes = _get_chunk_bytes_limit(self.data.size * np.dtype(dtype).itemsize)
+        dask_array = get_dask_array(signal=self, dtype=dtype, chunk_bytes=chunk_bytes)
 
         if std is None:
             std = self.axes_manager.signal_shape[0] / 8
@@ -743,7 +745,12 @@ class EBSD(CommonImage, Signal2D):
 
         if dtype_out is None:
             dtype_out = self.data.dtype.type
-        dask_array = get_dask_array(self, dtype=dtype_out)
+        # Split the patterns into at least as many chunks as there are
+        # CPUs, so that all patterns are filtered in parallel
+        chunk_bytes = _get_chunk_bytes_limit(
+            self.data.size * np.dtype(dtype_out).itemsize
+        )
+        dask_array = get_dask_array(self, dtype=dtype_out, chunk_bytes=chunk_bytes)
 
         background_patterns = dask_array.map_blocks(
             func=chunk.get_dynamic_background,
@@ -899,7 +906,7 @@ class EBSD(CommonImage, Signal2D):
         # Calculate frequency vectors
         sx, sy = self.axes_manager.signal_shape
         frequency_vectors = fft_frequency_vectors((sy, sx))
-        inertia_max = np.sum(frequency_vectors) / (sy * sx)
+        inertia_max = np.sum(frequency_vectors, dtype=np.float64) / (sy * sx)
 
         # Calculate image quality per chunk
         image_quality_map = dask_array.map_blocks(
@@ -17,24 +17,37 @@
 # along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
 
 import copy
+from functools import lru_cache
+import math
 import sys
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 
 import dask.array as da
 from dask.diagnostics import ProgressBar
 from hyperspy._lazy_signals import LazySignal2D
 from hyperspy._signals.signal2d import Signal2D
+from numba import njit
 import numpy as np
 from orix.crystal_map import CrystalMap, Phase, PhaseList
-from orix.vector import Vector3d
 from orix.quaternion import Rotation
+from skimage.util.dtype import dtype_range
 
 from kikuchipy.detectors.ebsd_detector import EBSDDetector
-from kikuchipy.pattern import rescale_intensity
-from kikuchipy.projections.lambert_projection import LambertProjection
 from kikuchipy.signals import LazyEBSD, EBSD
 from kikuchipy.signals._common_image import CommonImage
-from kikuchipy.signals.util._dask import get_chunking
+from kikuchipy.signals.util._dask import get_chunking, _get_chunk_bytes_limit
+
+
+# Number of rotations and detector tile size (in pixels along each
+# axis) processed together when projecting patterns from a master
+# pattern
+_ROTATION_BLOCK_SIZE = 8
+_DETECTOR_TILE_SIZE = 16
+
+# Constants of the square Lambert projection, with the scaling by
+# sqrt(pi / 2) to the master pattern folded in
+_SQRT_HALF = np.sqrt(0.5)
+_TWO_SQRT_TWO_OVER_PI = 2 * np.sqrt(2) / np.pi
 
 
 class EBSDMasterPattern(CommonImage, Signal2D):
@@ -85,6 +98,7 @@ class EBSDMasterPattern(CommonImage, Signal2D):
         energy: Union[int, float],
         dtype_out: type = np.float32,
         compute: bool = False,
+        out: Optional[np.ndarray] = None,
         **kwargs,
     ) -> Union[EBSD, LazyEBSD]:
         """Return a dictionary of EBSD patterns projected onto a
@@ -111,12 +125,23 @@ class EBSDMasterPattern(CommonImage, Signal2D):
         compute
             Whether to return a lazy result, by default False. For more
             information see :func:`~dask.array.Array.compute`.
+        out
+            Array to write the patterns to, with shape equal to the
+            rotation object's shape plus the detector shape and data
+            type `dtype_out`. Can only be passed if `compute` is True.
+            Patterns are written to this array chunk by chunk, avoiding
+            allocating another array of the full dictionary size, and
+            it is used as the returned signal's data. If not given
+            (default), a new array is allocated.
         kwargs
             Keyword arguments passed to
             :func:`~kikuchipy.signals.util.get_chunking` to control the
             number of chunks the dictionary creation and the output data
             array is split into. Only `chunk_shape`, `chunk_bytes` and
-            `dtype_out` (to `dtype`) are passed on.
+            `dtype_out` (to `dtype`) are passed on. If `chunk_bytes` is
+            not passed, the rotations are split into at least as many
+            chunks as there are CPUs, with chunks no larger than dask's
+            configured "array.chunk-size".
 
         Returns
         -------
@@ -151,12 +176,28 @@ class EBSDMasterPattern(CommonImage, Signal2D):
                 f"object with {nav_dim} was passed"
             )
         data_shape = nav_shape + detector.shape
+        if out is not None:
+            if not compute:
+                raise ValueError(
+                    "An output array can only be passed if `compute` is True"
+                )
+            if out.shape != data_shape or out.dtype != np.dtype(dtype_out):
+                raise ValueError(
+                    f"The output array must have shape {data_shape} and data type "
+                    f"{np.dtype(dtype_out)}, but has shape {out.shape} and data type "
+                    f"{out.dtype}"
+                )
+        chunk_bytes = kwargs.pop("chunk_bytes", None)
+        if chunk_bytes is None:
+            # Keep all CPUs busy, also for small dictionaries
+            nbytes = np.prod(data_shape) * np.dtype(dtype_out).itemsize
+            chunk_bytes = _get_chunk_bytes_limit(nbytes)
         chunks = get_chunking(
             data_shape=data_shape,
             nav_dim=nav_dim,
             sig_dim=len(detector.shape),
             chunk_shape=kwargs.pop("chunk_shape", None),
-            chunk_bytes=kwargs.pop("chunk_bytes", None),
+            chunk_bytes=chunk_bytes,
             dtype=dtype_out,
         )
 
@@ -175,8 +216,8 @@ class EBSDMasterPattern(CommonImage, Signal2D):
                 "current {self.phase.point_group.name}, both hemispheres must be "
                 "present in the master pattern signal"
             )
-        master_north = self.data[north_slice]
-        master_south = self.data[south_slice]
+        master_north = _get_master_pattern_array(self.data[north_slice])
+        master_south = _get_master_pattern_array(self.data[south_slice])
 
         # Whether to rescale pattern intensities after projection
         rescale = False
@@ -187,25 +228,25 @@ class EBSDMasterPattern(CommonImage, Signal2D):
         # source point
         dc = _get_direction_cosines(detector)
 
-        # Get dask array from rotations
-        r_da = da.from_array(rotations.data, chunks=chunks[:nav_dim] + (-1,))
-
-        # Which axes to drop and add when iterating over the rotations
-        # dask array to produce the EBSD signal array, i.e. drop the
-        # (4,)-shape quaternion axis and add detector shape axes, e.g.
-        # (60, 60)
-        if nav_dim == 1:
-            drop_axis = 1
-            new_axis = (1, 2)
-        else:  # nav_dim == 2
-            drop_axis = 2
-            new_axis = (2, 3)
-
-        # Project simulated patterns onto detector
+        # Get dask array from rotations as contiguous 32-bit quaternions,
+        # which is sufficient precision for the projection
+        r_arr = np.ascontiguousarray(rotations.data, dtype=np.float32)
+        r_da = da.from_array(r_arr, chunks=chunks[:nav_dim] + (-1,))
+
+        # Project simulated patterns onto detector, iterating over the
+        # rotation chunks. The (4,)-shape quaternion axis, in one chunk,
+        # is dropped, and detector shape axes are added, e.g. (60, 60)
         npx, npy = self.axes_manager.signal_shape
         scale = (npx - 1) / 2
-        simulated = r_da.map_blocks(
+        nav_index = "ab"[:nav_dim]
+        simulated = da.blockwise(
             _get_patterns_chunk,
+            nav_index + "yx",
+            r_da,
+            nav_index + "q",
+            new_axes={"y": detector.shape[0], "x": detector.shape[1]},
+            concatenate=True,
+            dtype=dtype_out,
             dc=dc,
             master_north=master_north,
             master_south=master_south,
@@ -214,10 +255,6 @@ class EBSDMasterPattern(CommonImage, Signal2D):
             scale=scale,
             rescale=rescale,
             dtype_out=dtype_out,
-            drop_axis=drop_axis,
-            new_axis=new_axis,
-            chunks=chunks,
-            dtype=dtype_out,
         )
 
         # Add crystal map and detector to keyword arguments
@@ -251,12 +288,16 @@ class EBSDMasterPattern(CommonImage, Signal2D):
                     f"Creating a dictionary of {nav_shape} simulated patterns:",
                     file=sys.stdout,
                 )
-                patterns = simulated.compute()
-            out = EBSD(patterns, axes=axes, **kwargs)
+                if out is None:
+                    patterns = simulated.compute()
+                else:
+                    da.store(simulated, out, lock=False)
+                    patterns = out
+            s_out = EBSD(patterns, axes=axes, **kwargs)
         else:
-            out = LazyEBSD(simulated, axes=axes, **kwargs)
+            s_out = LazyEBSD(simulated, axes=axes, **kwargs)
 
-        return out
+        return s_out
 
     # ------ Methods overwritten from hyperspy.signals.Signal2D ------ #
     def deepcopy(self):
@@ -282,7 +323,36 @@ class LazyEBSDMasterPattern(EBSDMasterPattern, LazySignal2D):
         super().__init__(*args, **kwargs)
 
 
-def _get_direction_cosines(detector: EBSDDetector) -> Vector3d:
+def _get_master_pattern_array(
+    master_pattern: Union[np.ndarray, da.Array]
+) -> np.ndarray:
+    """Return a contiguous master pattern array in the narrowest data
+    type intensities can be interpolated from without loss.
+
+    Integer master patterns of at most 16 bits, like EMsoft master
+    patterns converted to 8-bit, are kept as is, while other data types
+    are cast to 32-bit floating point. This reduces the number of bytes
+    read from the master pattern per detector pixel.
+
+    Parameters
+    ----------
+    master_pattern
+        Master pattern in one hemisphere.
+
+    Returns
+    -------
+    numpy.ndarray
+        Contiguous master pattern array.
+    """
+    dtype = master_pattern.dtype
+    if not (np.issubdtype(dtype, np.integer) and dtype.itemsize <= 2):
+        dtype = np.float32
+    return np.ascontiguousarray(master_pattern, dtype=dtype)
+
+
+def _get_direction_cosines(
+    detector: EBSDDetector, out: Optional[np.ndarray] = None
+) -> np.ndarray:
     """Get the direction cosines between the detector and sample as done
     in EMsoft and :cite:`callahan2013dynamical`.
 
@@ -291,11 +361,17 @@ def _get_direction_cosines(detector: EBSDDetector) -> Vector3d:
     detector : EBSDDetector
         EBSDDetector object with a certain detector geometry and one
         projection center.
+    out
+        Array of shape (3, nrows, ncols) to write the direction cosines
+        to, useful when calling this function repeatedly. If not given
+        (default), a new array is allocated.
 
     Returns
     -------
-    Vector3d
-        Direction cosines for each detector pixel.
+    numpy.ndarray
+        Direction cosines unit vectors of shape (3, nrows, ncols) for
+        each detector pixel, with each vector component in one
+        contiguous detector array. This is `out` if given.
     """
     nrows, ncols = detector.shape
 
@@ -311,101 +387,71 @@ def _get_direction_cosines(detector: EBSDDetector) -> Vector3d:
     det_x = -((-xpc - (1.0 - ncols) * 0.5) - ncols_array)
     det_y = (ypc - (1.0 - nrows) * 0.5) - nrows_array
 
-    # Auxilliary angle to rotate between reference frames
-    theta_c = np.radians(detector.tilt)
-    sigma = np.radians(detector.sample_tilt)
-
-    alpha = (np.pi / 2) - sigma + theta_c
-    ca = np.cos(alpha)
-    sa = np.sin(alpha)
-
-    # Angle between normal of sample and detector. A positive angle
-    # means the detector normal moves towards the right looking from the
-    # detector to the sample
-    omega = np.radians(detector.azimuthal)
-    cw = np.cos(omega)
-    sw = np.sin(omega)
+    # Cosine and sine of the auxilliary angle to rotate between
+    # reference frames, and of the detector azimuthal angle
+    ca, sa, cw, sw = _get_detector_angle_cos_sin(
+        float(detector.tilt), float(detector.sample_tilt), float(detector.azimuthal)
+    )
 
-    r_g_array = np.zeros((nrows, ncols, 3))
+    if out is None:
+        out = np.empty((3, nrows, ncols))
 
     Ls = -sw * det_x + L * cw
     Lc = cw * det_x + L * sw
 
-    i, j = np.meshgrid(nrows_array[::-1], ncols_array, indexing="ij")
+    # Broadcast row and column coordinates over the detector, with
+    # rows in reverse order
+    det_y = det_y[::-1, np.newaxis]
+
+    out[0] = det_y * ca + sa * Ls
+    out[1] = Lc
+    out[2] = -sa * det_y + ca * Ls
 
-    r_g_array[..., 0] = det_y[i] * ca + sa * Ls[j]
-    r_g_array[..., 1] = Lc[j]
-    r_g_array[..., 2] = -sa * det_y[i] + ca * Ls[j]
-    r_g = Vector3d(r_g_array)
+    # Normalize to unit vectors in place
+    norm = np.sqrt(out[0] ** 2 + out[1] ** 2 + out[2] ** 2)
+    out /= norm
 
-    return r_g.unit
+    return out
 
 
-def _get_lambert_interpolation_parameters(
-    rotated_direction_cosines: Vector3d, npx: int, npy: int, scale: Union[int, float]
-) -> tuple:
-    """Get interpolation parameters in the square Lambert projection, as
-    implemented in EMsoft.
+@lru_cache(maxsize=128)
+def _get_detector_angle_cos_sin(
+    tilt: float, sample_tilt: float, azimuthal: float
+) -> Tuple[float, float, float, float]:
+    """Return the cosine and sine of the auxilliary angle to rotate
+    between the detector and sample reference frames, and of the
+    detector azimuthal angle.
+
+    The values are cached, since the same detector angles are used
+    repeatedly when e.g. refining projection centers.
 
     Parameters
     ----------
-    rotated_direction_cosines
-        Rotated direction cosines vector.
-    npx
-        Number of pixels on the master pattern in the x direction.
-    npy
-        Number of pixels on the master pattern in the y direction.
-    scale
-        Factor to scale up from the square Lambert projection to the
-        master pattern.
+    tilt
+        Detector tilt in degrees.
+    sample_tilt
+        Sample tilt in degrees.
+    azimuthal
+        Detector azimuthal angle in degrees.
 
     Returns
     -------
-    nii : numpy.ndarray
-        Row coordinate of a point.
-    nij : numpy.ndarray
-        Column coordinate of a point.
-    niip : numpy.ndarray
-        Row coordinate of neighboring point.
-    nijp : numpy.ndarray
-        Column coordinate of a neighboring point.
-    di : numpy.ndarray
-        Row interpolation weight factor.
-    dj : numpy.ndarray
-        Column interpolation weight factor.
-    dim : numpy.ndarray
-        Row interpolation weight factor.
-    djm : numpy.ndarray
-        Column interpolation weight factor.
+    ca, sa
+        Cosine and sine of the auxilliary angle.
+    cw, sw
+        Cosine and sine of the azimuthal angle.
     """
-    # Direction cosines to the square Lambert projection
-    xy = (
-        scale
-        * LambertProjection.project(rotated_direction_cosines)
-        / (np.sqrt(np.pi / 2))
-    )
-
-    i = xy[..., 1]
-    j = xy[..., 0]
-    nii = (i + scale).astype(int)
-    nij = (j + scale).astype(int)
-    niip = nii + 1
-    nijp = nij + 1
-    niip = np.where(niip < npx, niip, nii).astype(int)
-    nijp = np.where(nijp < npy, nijp, nij).astype(int)
-    nii = np.where(nii < 0, niip, nii).astype(int)
-    nij = np.where(nij < 0, nijp, nij).astype(int)
-    di = i - nii + scale
-    dj = j - nij + scale
-    dim = 1.0 - di
-    djm = 1.0 - dj
-
-    return nii, nij, niip, nijp, di, dj, dim, djm
+    alpha = (math.pi / 2) - math.radians(sample_tilt) + math.radians(tilt)
+    # Angle between normal of sample and detector. A positive angle
+    # means the detector normal moves towards the right looking from the
+    # detector to the sample
+    omega = math.radians(azimuthal)
+    return math.cos(alpha), math.sin(alpha), math.cos(omega), math.sin(omega)
 
 
 def _get_patterns_chunk(
     rotations_array: np.ndarray,
-    dc: Vector3d,
+    dc: np.ndarray,
     master_north: np.ndarray,
     master_south: np.ndarray,
     npx: int,
@@ -424,7 +470,8 @@ def _get_patterns_chunk(
         Array of rotations of shape (..., 4) for a given chunk in
         quaternions.
     dc
-        Direction cosines unit vector between detector and sample.
+        Direction cosines unit vectors between detector and sample of
+        shape (3, nrows, ncols).
     master_north
         Northern hemisphere of the master pattern.
     master_south
@@ -437,7 +484,8 @@ def _get_patterns_chunk(
         Factor to scale up from square Lambert projection to the master
         pattern.
     rescale
-        Whether to call rescale_intensities() or not.
+        Whether to rescale pattern intensities to the full `dtype_out`
+        range.
     dtype_out
         Data type of the returned patterns, by default np.float32.
 
@@ -446,39 +494,273 @@ def _get_patterns_chunk(
     numpy.ndarray
         3D or 4D array with simulated patterns.
     """
-    rotations = Rotation(rotations_array)
     rotations_shape = rotations_array.shape[:-1]
-    simulated = np.empty(shape=rotations_shape + dc.shape, dtype=dtype_out)
-    for i in np.ndindex(rotations_shape):
-        rotated_dc = rotations[i] * dc
-        (
-            nii,
-            nij,
-            niip,
-            nijp,
-            di,
-            dj,
-            dim,
-            djm,
-        ) = _get_lambert_interpolation_parameters(
-            rotated_direction_cosines=rotated_dc, npx=npx, npy=npy, scale=scale
-        )
-        pattern = np.where(
-            rotated_dc.z >= 0,
-            (
-                master_north[nii, nij] * dim * djm
-                + master_north[niip, nij] * di * djm
-                + master_north[nii, nijp] * dim * dj
-                + master_north[niip, nijp] * di * dj
-            ),
-            (
-                master_south[nii, nij] * dim * djm
-                + master_south[niip, nij] * di * djm
-                + master_south[nii, nijp] * dim * dj
-                + master_south[niip, nijp] * di * dj
-            ),
-        )
+    rotations_array = rotations_array.reshape((-1, 4))
+    n_rotations = rotations_array.shape[0]
+    detector_shape = dc.shape[1:]
+    simulated = np.empty(shape=(n_rotations,) + detector_shape, dtype=dtype_out)
+
+    # Rescale intensities to the full output data type range
+    if rescale:
+        omin, omax = dtype_range[np.dtype(dtype_out).type]
+    else:
+        omin, omax = 0, 0
+
+    _project_patterns_from_master_pattern(
+        rotations=rotations_array,
+        dc=dc,
+        master_north=master_north,
+        master_south=master_south,
+        npx=npx,
+        npy=npy,
+        scale=scale,
+        rescale=rescale,
+        omin=omin,
+        omax=omax,
+        out=simulated,
+    )
+
+    return simulated.reshape(rotations_shape + detector_shape)
+
+
+@njit(cache=True, nogil=True)
+def _project_patterns_from_master_pattern(
+    rotations: np.ndarray,
+    dc: np.ndarray,
+    master_north: np.ndarray,
+    master_south: np.ndarray,
+    npx: int,
+    npy: int,
+    scale: float,
+    rescale: bool,
+    omin: float,
+    omax: float,
+    out: np.ndarray,
+):
+    """Fill `out` with one pattern per rotation, projected from the
+    master pattern onto the detector by bilinear interpolation.
+
+    Intensities are written directly to `out` if `rescale` is False.
+    Otherwise, they are written to a float32 scratch pattern while
+    tracking the min./max. intensity, and then rescaled to the
+    (`omin`, `omax`) range in a second pass.
+
+    Rotations are processed in blocks of
+    :data:`_ROTATION_BLOCK_SIZE`, and the detector in square tiles of
+    :data:`_DETECTOR_TILE_SIZE` pixels. All rotations in a block are
+    projected onto one tile before moving on to the next tile, so that
+    master pattern intensities gathered for similar rotations are
+    likely still in cache.
+
+    Parameters
+    ----------
+    rotations
+        Array of rotations of shape (n, 4) in quaternions.
+    dc
+        Direction cosines unit vectors of shape (3, nrows, ncols).
+    master_north
+        Northern hemisphere of the master pattern.
+    master_south
+        Southern hemisphere of the master pattern.
+    npx
+        Number of pixels in the x-direction on the master pattern.
+    npy
+        Number of pixels in the y-direction on the master pattern.
+    scale
+        Factor to scale up from square Lambert projection to the master
+        pattern.
+    rescale
+        Whether to rescale pattern intensities to (`omin`, `omax`).
+    omin, omax
+        Output intensity range if `rescale` is True.
+    out
+        Array of shape (n, nrows, ncols) to write the patterns to.
+    """
+    n_rotations = rotations.shape[0]
+    nrows, ncols = dc.shape[1:]
+    matrices = _get_rotation_matrices(rotations)
+    block_size = _ROTATION_BLOCK_SIZE
+    tile_size = _DETECTOR_TILE_SIZE
+
+    if rescale:
+        scratch = np.empty((block_size, nrows, ncols), dtype=np.float32)
+    else:
+        scratch = np.empty((0, 0, 0), dtype=np.float32)
+    pmin = np.empty(block_size)
+    pmax = np.empty(block_size)
+
+    for n0 in range(0, n_rotations, block_size):
+        n1 = min(n0 + block_size, n_rotations)
+        pmin[:] = np.inf
+        pmax[:] = -np.inf
+
+        for r0 in range(0, nrows, tile_size):
+            r1 = min(r0 + tile_size, nrows)
+            for s0 in range(0, ncols, tile_size):
+                s1 = min(s0 + tile_size, ncols)
+
+                for n in range(n0, n1):
+                    matrix = matrices[n]
+                    for r in range(r0, r1):
+                        for s in range(s0, s1):
+                            value = _project_pixel_from_master_pattern(
+                                matrix,
+                                dc[0, r, s],
+                                dc[1, r, s],
+                                dc[2, r, s],
+                                master_north,
+                                master_south,
+                                npx,
+                                npy,
+                                scale,
+                            )
+                            if rescale:
+                                k = n - n0
+                                scratch[k, r, s] = value
+                                pmin[k] = min(pmin[k], scratch[k, r, s])
+                                pmax[k] = max(pmax[k], scratch[k, r, s])
+                            else:
+                                out[n, r, s] = value
+
         if rescale:
-            pattern = rescale_intensity(pattern, dtype_out=dtype_out)
-        simulated[i] = pattern
-    return simulated
+            for n in range(n0, n1):
+                k = n - n0
+                intensity_range = pmax[k] - pmin[k]
+                if intensity_range == 0:
+                    intensity_range = 1
+                for r in range(nrows):
+                    for s in range(ncols):
+                        out[n, r, s] = (scratch[k, r, s] - pmin[k]) / (
+                            intensity_range
+                        ) * (omax - omin) + omin
+
+
+@njit(cache=True, nogil=True)
+def _get_rotation_matrices(rotations: np.ndarray) -> np.ndarray:
+    """Return the rotation matrix of each quaternion, rotating vectors
+    like orix does.
+
+    Parameters
+    ----------
+    rotations
+        Array of rotations of shape (n, 4) in quaternions.
+
+    Returns
+    -------
+    numpy.ndarray
+        Rotation matrices of shape (n, 3, 3).
+    """
+    n_rotations = rotations.shape[0]
+    matrices = np.empty((n_rotations, 3, 3))
+    for n in range(n_rotations):
+        a = rotations[n, 0]
+        b = rotations[n, 1]
+        c = rotations[n, 2]
+        d = rotations[n, 3]
+        matrices[n, 0, 0] = a ** 2 + b ** 2 - c ** 2 - d ** 2
+        matrices[n, 0, 1] = 2 * (b * c - a * d)
+        matrices[n, 0, 2] = 2 * (a * c + b * d)
+        matrices[n, 1, 0] = 2 * (a * d + b * c)
+        matrices[n, 1, 1] = a ** 2 - b ** 2 + c ** 2 - d ** 2
+        matrices[n, 1, 2] = 2 * (c * d - a * b)
+        matrices[n, 2, 0] = 2 * (b * d - a * c)
+        matrices[n, 2, 1] = 2 * (a * b + c * d)
+        matrices[n, 2, 2] = a ** 2 - b ** 2 - c ** 2 + d ** 2
+    return matrices
+
+
+@njit(cache=True, nogil=True)
+def _project_pixel_from_master_pattern(
+    matrix: np.ndarray,
+    x: float,
+    y: float,
+    z: float,
+    master_north: np.ndarray,
+    master_south: np.ndarray,
+    npx: int,
+    npy: int,
+    scale: float,
+) -> float:
+    """Return the intensity of one detector pixel, found by rotating
+    its direction cosine by a rotation matrix, projecting it onto the square
+    Lambert projection, and interpolating the master pattern there.
+
+    Parameters
+    ----------
+    matrix
+        Rotation matrix of shape (3, 3).
+    x, y, z
+        Direction cosine of the detector pixel.
+    master_north
+        Northern hemisphere of the master pattern.
+    master_south
+        Southern hemisphere of the master pattern.
+    npx
+        Number of pixels in the x-direction on the master pattern.
+    npy
+        Number of pixels in the y-direction on the master pattern.
+    scale
+        Factor to scale up from square Lambert projection to the master
+        pattern.
+
+    Returns
+    -------
+    float
+        Pixel intensity.
+    """
+    # Rotate direction cosine
+    rx = matrix[0, 0] * x + matrix[0, 1] * y + matrix[0, 2] * z
+    ry = matrix[1, 0] * x + matrix[1, 1] * y + matrix[1, 2] * z
+    rz = matrix[2, 0] * x + matrix[2, 1] * y + matrix[2, 2] * z
+    norm = np.sqrt(rx ** 2 + ry ** 2 + rz ** 2)
+    ux = rx / norm
+    uy = ry / norm
+    uz = rz / norm
+
+    # Equations (10a) and (10b) from Callahan and De Graef (2013),
+    # scaled up to the master pattern, returning (0, 0) where |z| = 1
+    if ux == 0 and uy == 0:
+        i = 0.0
+        j = 0.0
+    else:
+        sqrt_z = np.sqrt(2 * (1 - abs(uz))) * scale
+        if abs(uy) <= abs(ux):
+            if ux < 0:
+                sqrt_z = -sqrt_z
+            i = sqrt_z * _TWO_SQRT_TWO_OVER_PI * np.arctan(uy / ux)
+            j = sqrt_z * _SQRT_HALF
+        else:
+            if uy < 0:
+                sqrt_z = -sqrt_z
+            i = sqrt_z * _SQRT_HALF
+            j = sqrt_z * _TWO_SQRT_TWO_OVER_PI * np.arctan(ux / uy)
+
+    # Interpolation parameters in the master pattern
+    nii = int(i + scale)
+    nij = int(j + scale)
+    niip = nii + 1
+    nijp = nij + 1
+    if niip >= npx:
+        niip = nii
+    if nijp >= npy:
+        nijp = nij
+    if nii < 0:
+        nii = niip
+    if nij < 0:
+        nij = nijp
+    di = i - nii + scale
+    dj = j - nij + scale
+    dim = 1.0 - di
+    djm = 1.0 - dj
+
+    # Only interpolate in the hemisphere the rotated vector points to
+    if rz >= 0:
+        master = master_north
+    else:
+        master = master_south
+    return (
+        master[nii, nij] * dim * djm
+        + master[niip, nij] * di * djm
+        + master[nii, nijp] * dim * dj
+        + master[niip, nijp] * di * dj
+    )
@@ -23,8 +23,8 @@ from hyperspy.api import load as hs_load
 from hyperspy._signals.signal2d import Signal2D
 import numpy as np
 from orix.crystal_map import Phase
-from orix.vector import Vector3d
 from orix.quaternion import Rotation
+from orix.vector import Vector3d
 import pytest
 
 import kikuchipy as kp
@@ -37,9 +37,11 @@ from kikuchipy.io.plugins.tests.test_emsoft_ebsd_masterpattern import (
 )
 from kikuchipy.signals.tests.test_ebsd import assert_dictionary
 from kikuchipy.signals.ebsd_master_pattern import (
+    _get_detector_angle_cos_sin,
     _get_direction_cosines,
-    _get_lambert_interpolation_parameters,
+    _get_master_pattern_array,
     _get_patterns_chunk,
+    _get_rotation_matrices,
 )
 from kikuchipy.indexing.similarity_metrics import ncc, ndp
 
@@ -168,29 +170,25 @@ class TestSimulatedPatternDictionary:
 
     def test_get_direction_cosines(self):
         out = _get_direction_cosines(self.detector)
-        assert isinstance(out, Vector3d)
-
-    def test_get_lambert_interpolation_parameters(self):
-        dc = _get_direction_cosines(self.detector)
-        npx = 1001
-        npy = 1001
-        scale = 500
-        nii, nij, niip, nijp = _get_lambert_interpolation_parameters(
-            rotated_direction_cosines=dc, npx=npx, npy=npy, scale=scale
-        )[:4]
-
-        assert (nii <= niip).all()
-        assert (nij <= nijp).all()
-
-        assert (nii < npx).all()
-        assert (nij < npy).all()
-        assert (niip < npx).all()
-        assert (nijp < npx).all()
-
-        assert (nii >= 0).all()
-        assert (nij >= 0).all()
-        assert (niip >= 0).all()
-        assert (nijp >= 0).all()
+        assert isinstance(out, np.ndarray)
+        assert out.shape == (3,) + self.detector.shape
+        assert out[0].flags["C_CONTIGUOUS"]
+        assert np.allclose(np.linalg.norm(out, axis=0), 1)
+
+        out2 = np.zeros_like(out)
+        out3 = _get_direction_cosines(self.detector, out=out2)
+        assert out3 is out2
+        assert np.allclose(out2, out)
+
+    def test_get_detector_angle_cos_sin(self):
+        _get_detector_angle_cos_sin.cache_clear()
+        ca, sa, cw, sw = _get_detector_angle_cos_sin(10.0, 70.0, 5.0)
+        alpha = np.pi / 2 - np.radians(70) + np.radians(10)
+        assert np.allclose([ca, sa], [np.cos(alpha), np.sin(alpha)])
+        assert np.allclose([cw, sw], [np.cos(np.radians(5)), np.sin(np.radians(5))])
+
+        _ = _get_detector_angle_cos_sin(10.0, 70.0, 5.0)
+        assert _get_detector_angle_cos_sin.cache_info().hits == 1
 
     def test_get_patterns(self):
         # Ni Test
@@ -297,7 +295,60 @@ class TestSimulatedPatternDictionary:
             rescale=False,
         )
 
-        assert out.shape == r.shape + dc.shape
+        assert out.shape == r.shape + self.detector.shape
+
+    def test_get_patterns_chunk_rescale(self):
+        r = Rotation.from_euler(((0, 0, 0), (1, 1, 1), (2, 2, 2)))
+        dc = _get_direction_cosines(self.detector)
+
+        npx = 101
+        mpn = np.random.random((npx, npx)).astype(np.float32)
+        out = _get_patterns_chunk(
+            rotations_array=r.data,
+            dc=dc,
+            master_north=mpn,
+            master_south=mpn,
+            npx=npx,
+            npy=npx,
+            scale=(npx - 1) / 2,
+            rescale=True,
+            dtype_out=np.uint8,
+        )
+
+        assert out.dtype == np.uint8
+        assert np.all(out.min(axis=(1, 2)) == 0)
+        assert np.all(out.max(axis=(1, 2)) == 255)
+
+    def test_get_rotation_matrices(self):
+        r = Rotation.from_euler(np.random.uniform(0, np.pi, (5, 3)))
+        v = Vector3d(np.random.uniform(-1, 1, (5, 3)))
+        matrices = _get_rotation_matrices(r.data)
+        assert matrices.shape == (5, 3, 3)
+        rotated = np.einsum("nij,nj->ni", matrices, v.data)
+        for i in range(5):
+            assert np.allclose(rotated[i], (r[i] * v[i]).data)
+
+    @pytest.mark.parametrize(
+        "dtype_in, dtype_out",
+        [
+            (np.uint8, np.uint8),
+            (np.uint16, np.uint16),
+            (np.int32, np.float32),
+            (np.float32, np.float32),
+            (np.float64, np.float32),
+        ],
+    )
+    def test_get_master_pattern_array(self, dtype_in, dtype_out):
+        mp = np.arange(2 * 11 * 11).reshape((2, 11, 11)).astype(dtype_in)
+        mp_south = _get_master_pattern_array(mp[1])
+
+        assert mp_south.dtype == dtype_out
+        assert mp_south.flags["C_CONTIGUOUS"]
+        assert np.allclose(mp_south, mp[1])
+
+        mp_lazy = _get_master_pattern_array(da.from_array(mp)[:, :, ::2])
+        assert isinstance(mp_lazy, np.ndarray)
+        assert mp_lazy.flags["C_CONTIGUOUS"]
 
     def test_simulated_patterns_xmap_detector(self):
         mp = nickel_ebsd_master_pattern_small(projection="lambert")
@@ -333,6 +384,52 @@ class TestSimulatedPatternDictionary:
         with pytest.raises(ValueError, match="The rotations object can only"):
             _ = mp.get_patterns(rotations=r, detector=detector, energy=20)
 
+    def test_get_patterns_out(self):
+        mp = nickel_ebsd_master_pattern_small(projection="lambert")
+        r = Rotation(np.random.uniform(low=0, high=1, size=(2, 3, 4)))
+        detector = kp.detectors.EBSDDetector(shape=(60, 60))
+        sim = mp.get_patterns(
+            rotations=r, detector=detector, energy=20, dtype_out=np.uint8
+        )
+
+        out = np.zeros((2, 3, 60, 60), dtype=np.uint8)
+        sim_out = mp.get_patterns(
+            rotations=r,
+            detector=detector,
+            energy=20,
+            dtype_out=np.uint8,
+            compute=True,
+            out=out,
+            chunk_shape=1,
+        )
+        assert np.shares_memory(sim_out.data, out)
+        assert np.allclose(out, sim.data.compute())
+
+    def test_get_patterns_out_raises(self):
+        mp = nickel_ebsd_master_pattern_small(projection="lambert")
+        r = Rotation.identity((2,))
+        detector = kp.detectors.EBSDDetector(shape=(60, 60))
+        out = np.zeros((2, 60, 60), dtype=np.float32)
+        with pytest.raises(ValueError, match="An output array can only be"):
+            _ = mp.get_patterns(rotations=r, detector=detector, energy=20, out=out)
+        with pytest.raises(ValueError, match="The output array must have"):
+            _ = mp.get_patterns(
+                rotations=r,
+                detector=detector,
+                energy=20,
+                compute=True,
+                out=out[:1],
+            )
+        with pytest.raises(ValueError, match="The output array must have"):
+            _ = mp.get_patterns(
+                rotations=r,
+                detector=detector,
+                energy=20,
+                dtype_out=np.uint8,
+                compute=True,
+                out=out,
+            )
+
     def test_detector_azimuthal(self):
         """Test that setting an azimuthal angle of a detector results in
         different patterns.
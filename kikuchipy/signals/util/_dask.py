@@ -18,7 +18,10 @@
 
 from typing import List, Optional, Tuple, Union
 
+import dask
 import dask.array as da
+from dask.system import CPU_COUNT
+from dask.utils import parse_bytes
 import numpy as np
 
 
@@ -138,6 +141,28 @@ def get_dask_array(signal, dtype: Optional[np.dtype] = None, **kwargs) -> da.Arr
     return dask_array.astype(dtype)
 
 
+def _get_chunk_bytes_limit(nbytes: Union[int, float]) -> int:
+    """Return the max. number of bytes in each chunk of an array so that
+    it is split into at least as many chunks as there are CPUs.
+
+    The limit is never larger than dask's configured chunk size,
+    "array.chunk-size", which can be set with the
+    `DASK_ARRAY__CHUNK_SIZE` environment variable.
+
+    Parameters
+    ----------
+    nbytes
+        Number of bytes in the array to chunk.
+
+    Returns
+    -------
+    chunk_bytes
+        Max. number of bytes in each chunk.
+    """
+    chunk_bytes = parse_bytes(dask.config.get("array.chunk-size"))
+    return int(max(1, min(chunk_bytes, np.ceil(nbytes / CPU_COUNT))))
+
+
 def _get_chunk_overlap_depth(window, axes_manager, chunksize: tuple) -> dict:
     """Return overlap depth between navigation chunks equal to the max.
     number of nearest neighbours in each navigation axis.
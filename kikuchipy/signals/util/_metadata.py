@@ -202,6 +202,30 @@ def _write_parameters_to_dictionary(
             dictionary.set_item(node + "." + key, val)
 
 
+def _set_missing_metadata(
+    metadata: DictionaryTreeBrowser, defaults: dict, node: str = ""
+):
+    """Set items in a default metadata dictionary which are missing in
+    a metadata dictionary, in place.
+
+    Parameters
+    ----------
+    metadata
+        Dictionary to set missing items in.
+    defaults
+        Nested dictionary with default items.
+    node
+        String like 'Acquisition_instrument.SEM' etc. with dictionary
+        nodes `defaults` is relative to. Default is the root.
+    """
+    for key, val in defaults.items():
+        item = node + "." + key if node else key
+        if isinstance(val, dict):
+            _set_missing_metadata(metadata, val, item)
+        elif not metadata.has_item(item):
+            metadata.set_item(item, val)
+
+
 def _set_metadata_from_mapping(omd: dict, md: DictionaryTreeBrowser, mapping: dict):
     """Update metadata dictionary inplace from original metadata
     dictionary via a mapping.
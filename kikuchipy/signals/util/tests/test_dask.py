@@ -16,13 +16,16 @@
 # You should have received a copy of the GNU General Public License
 # along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
 
+import dask
 import dask.array as da
+from dask.system import CPU_COUNT
 import numpy as np
 import pytest
 
 from kikuchipy.signals.util._dask import (
     get_dask_array,
     get_chunking,
+    _get_chunk_bytes_limit,
     _rechunk_learning_results,
 )
 from kikuchipy.signals.ebsd import EBSD, LazyEBSD
@@ -90,6 +93,12 @@ class TestDask:
         assert array_out0.chunksize != array_out1.chunksize
         assert array_out1.chunksize == array_out2.chunksize
 
+    def test_get_chunk_bytes_limit(self):
+        assert _get_chunk_bytes_limit(CPU_COUNT * 100) == 100
+        assert _get_chunk_bytes_limit(1) == 1
+        with dask.config.set({"array.chunk-size": "1MiB"}):
+            assert _get_chunk_bytes_limit(CPU_COUNT * 2 ** 30) == 2 ** 20
+
     def test_rechunk_learning_results(self):
         data = da.from_array(np.random.rand(10, 100, 100, 5).astype(np.float32))
         lazy_signal = LazyEBSD(data)
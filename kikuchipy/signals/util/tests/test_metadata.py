@@ -16,12 +16,14 @@
 # You should have received a copy of the GNU General Public License
 # along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
 
+from hyperspy.misc.utils import DictionaryTreeBrowser
 import pytest
 
 from kikuchipy.signals.util._metadata import (
     ebsd_metadata,
     metadata_nodes,
     _set_metadata_from_mapping,
+    _set_missing_metadata,
 )
 
 
@@ -63,3 +65,15 @@ class TestMetadata:
 
         with pytest.warns(UserWarning, match="Could not read"):
             _ = _set_metadata_from_mapping(omd, md, {"a": "b"})
+
+    def test_set_missing_metadata(self):
+        sem_node, ebsd_node = metadata_nodes(["sem", "ebsd"])
+        md = DictionaryTreeBrowser({"General": {"title": "a"}})
+        md.set_item(sem_node + ".beam_energy", 20)
+
+        _set_missing_metadata(md, ebsd_metadata().as_dictionary())
+
+        assert md.General.title == "a"
+        assert md.get_item(sem_node + ".beam_energy") == 20
+        assert md.get_item(sem_node + ".microscope") == ""
+        assert md.get_item(ebsd_node + ".xpc") == -1.0
@@ -51,7 +51,12 @@ extra_feature_requirements = {
         "sphinx-gallery >= 0.6",
         "sphinxcontrib-bibtex >= 1.0",
     ],
-    "tests": ["coverage >= 5.0", "pytest >= 5.4", "pytest-cov >= 2.8.1"],
+    "tests": [
+        "coverage >= 5.0",
+        "pytest >= 5.4",
+        "pytest-cov >= 2.8.1",
+        "pytest-xdist >= 1.31",
+    ],
 }
 
 # Create a development project, including both the doc and tests projects
@@ -132,6 +137,7 @@ setup(
         "numpy              >= 1.19",
         "numba              >= 0.48",
         "orix               >= 0.6",
+        "packaging",
         "pooch              >= 0.13",
         "psutil",
         "tqdm               >= 0.5.2",